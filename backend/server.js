@@ -61,7 +61,15 @@ apiRouter.post('/health-reports', async (req, res) => {
     if (typeof reportData.timestamp === 'string') {
       reportData.timestamp = new Date(reportData.timestamp);
     }
-    
+
+    // Delta reports only carry changed checks, so fill in the rest from the latest report
+    if (reportData.full === false) {
+      const latestReport = await HealthReport.findOne({ machine_id: reportData.machine_id })
+        .sort({ timestamp: -1 })
+        .lean();
+      reportData.checks = { ...(latestReport ? latestReport.checks : {}), ...reportData.checks };
+    }
+
     const newReport = new HealthReport(reportData);
     await newReport.save();
     
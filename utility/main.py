@@ -1,34 +1,149 @@
 import os
+import re
 import platform
 import json
+import gzip
 import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import uuid
 import subprocess
 import threading
 import logging
+from logging.handlers import RotatingFileHandler
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+# POSIX-only module for locking the machine ID file
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Optional Windows-only modules for querying WMI and the registry directly
+try:
+    import winreg
+except ImportError:
+    winreg = None
+
+try:
+    import pythoncom
+    import wmi
+except ImportError:
+    wmi = None
+
+# One worker per health check run in collect_system_data
+HEALTH_CHECK_WORKERS = 4
+
+# Send a full snapshot at least this often; otherwise only changed checks are sent
+FULL_REPORT_INTERVAL = 24 * 3600  # 24 hours
+
+# Upper bound on how long any single check command may run
+SUBPROCESS_TIMEOUT = 15
+# Commands that may contact a remote server get longer
+NETWORK_SUBPROCESS_TIMEOUT = 30
+
+# apt writes these when the package lists are refreshed
+APT_UPDATE_STAMPS = [
+    '/var/lib/apt/periodic/update-success-stamp',
+    '/var/cache/apt/pkgcache.bin'
+]
+APT_UPDATE_MAX_AGE = 3600  # 1 hour
+
+# Back off the check interval while nothing changes
+BACKOFF_FACTOR = 1.5
+MAX_CHECK_INTERVAL = 4 * 3600  # 4 hours
+
+# Config files whose modification means a check must be re-run; while they are
+# unchanged the previous result is reused instead of spawning subprocesses
+ENCRYPTION_SOURCES = {
+    "Linux": ['/etc/crypttab', '/etc/fstab']
+}
+SLEEP_SETTING_SOURCES = {
+    "Darwin": ['/Library/Preferences/com.apple.PowerManagement.plist']
+}
+# Only the GNOME setting lives in dconf; the xset fallback is never cached
+GSETTINGS_SLEEP_SOURCES = {
+    "Linux": [os.path.join(os.path.expanduser("~"), '.config', 'dconf', 'user')]
+}
+
+# How long to wait for another instance to finish writing the machine ID
+MACHINE_ID_WAIT = 10
+# A pending machine ID write older than this was left by a crashed instance
+MACHINE_ID_STALE_AGE = 5
+
+# Windows display sleep timeout setting (Windows 10+)
+WINDOWS_SLEEP_SETTING_KEY = ('SYSTEM\\CurrentControlSet\\Control\\Power\\PowerSettings\\'
+                             '238C9FA8-0AAD-41ED-83F4-97BE242C8F20\\7bc4a2f9-d8fc-4469-b07b-33eb785aaca0')
+
+# PowerShell expressions for the Windows check data that has to come from
+# PowerShell; the ones needed each cycle are batched into a single invocation
+WINDOWS_SNAPSHOT_QUERIES = {
+    'av': "[bool](Get-MpComputerStatus).AntivirusEnabled",
+    'av2': "@(Get-WmiObject -Namespace root/SecurityCenter2 -Class AntiVirusProduct | ForEach-Object { $_.displayName })",
+    'updates': "(New-Object -ComObject Microsoft.Update.AutoUpdate).Results.UpdateCount -eq 0",
+    'sleep': f"(Get-ItemProperty -Path 'HKLM:\\{WINDOWS_SLEEP_SETTING_KEY}' -Name 'ACSettingIndex').ACSettingIndex / 60"
+}
+
 class SystemHealthMonitor:
+    # Patterns for parsing check command output
+    _RE_APFS_ENCRYPTED = re.compile(r'\b(?:FileVault|Encrypted):\s+Yes\b')
+    _RE_BITLOCKER_ON = re.compile(r'\bProtection On\b')
+    _RE_LUKS = re.compile(r'\bcrypto_LUKS\b')
+    _RE_MACOS_UP_TO_DATE = re.compile(r'No new software available')
+    _RE_APT_UP_TO_DATE = re.compile(r'^0 upgraded, 0 newly installed', re.M)
+    _RE_DISPLAYSLEEP = re.compile(r'^\s*displaysleep\s+(\d+)', re.M)
+    _RE_GSETTINGS_UINT = re.compile(r'(\d+)\s*$')
+    _RE_XSET_TIMEOUT = re.compile(r'^\s*timeout:\s+(\d+)', re.M)
+    
     def __init__(self, api_endpoint, check_interval=900):  # 15 minutes default
         self.api_endpoint = api_endpoint
         self.check_interval = check_interval
-        self.machine_id = self._get_machine_id()
-        self.last_report = {}
+        self._current_interval = check_interval
+        self._last_full_report_ts = 0
+        # Platform details don't change while running, so look them up once
+        self._system = platform.system()
+        self._version = platform.version()
+        # Reuse one HTTP connection across reports instead of reconnecting each time
+        self._session = requests.Session()
+        self._session.headers.update({
+            "Content-Type": "application/json",
+            "User-Agent": f"SystemHealthMonitor/{self._system}"
+        })
+        # Only connection failures are retried; replaying a POST after an error status
+        # could duplicate a report the server already saved
+        retries = Retry(total=3, backoff_factor=0.5)
+        self._session.mount("http://", HTTPAdapter(max_retries=retries))
+        self._session.mount("https://", HTTPAdapter(max_retries=retries))
+        self._win_snapshot = None
+        self._source_sigs = {}
+        self._source_results = {}
         self.logger = self._setup_logging()
+        self.machine_id = self._get_machine_id()
+        # Restore the last sent report so restarts don't resend unchanged state
+        self.last_report = self._load_last_report()
+        # Checks are independent and spend their time waiting on subprocesses, which
+        # releases the GIL, so threads give full concurrency without the pickling and
+        # process start-up cost of a ProcessPoolExecutor. One worker per check is
+        # enough; sizing by CPU count would only add idle threads on large machines.
+        self._executor = ThreadPoolExecutor(max_workers=HEALTH_CHECK_WORKERS,
+                                            thread_name_prefix='healthcheck')
         
     def _setup_logging(self):
-        # Create logs directory if it doesn't exist
-        logs_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'logs')
-        if not os.path.exists(logs_dir):
-            os.makedirs(logs_dir)
-            
         logger = logging.getLogger("SystemHealthMonitor")
+        # Already configured by an earlier instance; don't attach duplicate handlers
+        if logger.handlers:
+            return logger
         logger.setLevel(logging.INFO)
         
+        # Create logs directory if it doesn't exist
+        logs_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'logs')
+        os.makedirs(logs_dir, exist_ok=True)
+        
         # File handler for logs
         log_file = os.path.join(logs_dir, "health_monitor.log")
-        handler = logging.FileHandler(log_file)
+        handler = RotatingFileHandler(log_file, maxBytes=1_048_576, backupCount=3)  # 1 MB
         formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
         handler.setFormatter(formatter)
         logger.addHandler(handler)
@@ -43,69 +158,217 @@ class SystemHealthMonitor:
     def _get_machine_id(self):
         """Generate or retrieve a unique machine identifier."""
         # Determine the appropriate location for the ID file
-        if platform.system() == "Windows":
+        if self._system == "Windows":
             id_file = os.path.join(os.environ['LOCALAPPDATA'], 'SystemHealthMonitor', '.machine_id')
         else:  # macOS and Linux
             id_file = os.path.join(os.path.expanduser("~"), ".system_health_id")
         
+        # Last sent report is kept next to the ID file
+        self._state_file = id_file + '.last_report.json'
+        
         # Create directory if it doesn't exist
-        id_dir = os.path.dirname(id_file)
-        if not os.path.exists(id_dir):
-            os.makedirs(id_dir)
+        os.makedirs(os.path.dirname(id_file), exist_ok=True)
         
-        if os.path.exists(id_file):
+        tmp_file = id_file + '.tmp'
+        deadline = time.time() + MACHINE_ID_WAIT
+        while time.time() < deadline:
+            machine_id = self._read_machine_id(id_file)
+            if machine_id:
+                return machine_id
+            
+            # Claim the right to create the ID; only one instance can win
+            try:
+                fd = os.open(tmp_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600)
+            except FileExistsError:
+                # Another instance is writing an ID, so use theirs once it lands
+                try:
+                    if time.time() - os.path.getmtime(tmp_file) > MACHINE_ID_STALE_AGE:
+                        os.remove(tmp_file)
+                except OSError:
+                    pass
+                time.sleep(0.1)
+                continue
+            except OSError as e:
+                self.logger.error(f"Failed to save machine ID, using a temporary one: {e}")
+                return str(uuid.uuid4())
+            
+            # Another instance may have published between our read and our claim
+            machine_id = self._read_machine_id(id_file)
+            if machine_id:
+                os.close(fd)
+                try:
+                    os.remove(tmp_file)
+                except OSError:
+                    pass
+                return machine_id
+            
+            # Generate new ID and publish it atomically
+            machine_id = str(uuid.uuid4())
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    f.write(machine_id)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_file, id_file)
+            except Exception as e:
+                self.logger.error(f"Failed to save machine ID: {e}")
+                try:
+                    os.remove(tmp_file)
+                except OSError:
+                    pass
+            return machine_id
+        
+        self.logger.error("Timed out waiting for machine ID, using a temporary one")
+        return str(uuid.uuid4())
+    
+    def _read_machine_id(self, id_file):
+        """Read the machine ID file, returning None if it is missing or empty."""
+        try:
             with open(id_file, 'r') as f:
-                return f.read().strip()
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_SH)
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+    
+    def _load_last_report(self):
+        """Load the last successfully sent report from disk."""
+        try:
+            if os.path.exists(self._state_file):
+                with open(self._state_file, 'r') as f:
+                    data = json.load(f)
+                # A report sent under a different ID says nothing about this one
+                if data.get('machine_id') == self.machine_id:
+                    return data
+        except Exception as e:
+            self.logger.error(f"Failed to load last report: {e}")
+        return {}
+    
+    def _save_last_report(self, data):
+        """Atomically save the last successfully sent report to disk."""
+        tmp_file = self._state_file + '.tmp'
+        try:
+            with open(tmp_file, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_file, self._state_file)
+        except Exception as e:
+            self.logger.error(f"Failed to save last report: {e}")
+    
+    def _run_windows_snapshot(self, entries):
+        """Collect the given PowerShell-based Windows check data in one invocation."""
+        lines = ['$r = @{}']
+        for name in entries:
+            lines.append(f"try {{ $r.{name} = {WINDOWS_SNAPSHOT_QUERIES[name]} }} catch {{ $r.{name} = $null }}")
+        lines.append('ConvertTo-Json $r -Compress')
         
-        # Generate new ID if none exists
-        machine_id = str(uuid.uuid4())
         try:
-            with open(id_file, 'w') as f:
-                f.write(machine_id)
+            cmd = ["powershell", "-NoProfile", "-Command", "\n".join(lines)]
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=NETWORK_SUBPROCESS_TIMEOUT)
+            return json.loads(result.stdout)
         except Exception as e:
-            self.logger.error(f"Failed to save machine ID: {e}")
-            
-        return machine_id
+            self.logger.error(f"Failed to collect Windows status snapshot: {e}")
+            return None
+    
+    def _refresh_windows_snapshot(self):
+        """Collect this cycle's PowerShell-based Windows check data."""
+        # Only query what can't be read directly through WMI or the registry
+        entries = ['updates']
+        if wmi is None:
+            entries += ['av', 'av2']
+        if winreg is None:
+            entries.append('sleep')
+        self._win_snapshot = self._run_windows_snapshot(entries)
+    
+    def _source_unchanged(self, check_name, paths):
+        """Check if the config files behind a check are unchanged since it last ran."""
+        signature = []
+        for path in paths:
+            try:
+                st = os.stat(path)
+                signature.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                signature.append(None)
+        signature = tuple(signature)
+        
+        # Nothing to watch, so we can't tell whether anything changed
+        if all(sig is None for sig in signature):
+            self._source_sigs.pop(check_name, None)
+            return False
+        
+        unchanged = (self._source_sigs.get(check_name) == signature and
+                     check_name in self._source_results)
+        self._source_sigs[check_name] = signature
+        return unchanged
+    
+    def _run_cached_check(self, check_name, sources, probe):
+        """Run a check probe, reusing its last result while its config sources are unchanged."""
+        paths = sources.get(self._system)
+        if not paths:
+            return probe()
+        
+        if self._source_unchanged(check_name, paths):
+            return self._source_results[check_name]
+        
+        result = probe()
+        if result is None:
+            self._source_results.pop(check_name, None)
+        else:
+            self._source_results[check_name] = result
+        return result
     
     def check_disk_encryption(self):
         """Check if disk encryption is enabled."""
-        system = platform.system()
+        return self._run_cached_check("disk_encryption", ENCRYPTION_SOURCES, self._probe_disk_encryption)
+    
+    def _probe_disk_encryption(self):
+        """Probe the system for disk encryption status."""
+        system = self._system
         
         if system == "Darwin":  # macOS
             try:
-                result = subprocess.run(['diskutil', 'apfs', 'list'], capture_output=True, text=True)
-                return "Encrypted" in result.stdout
+                result = subprocess.run(['diskutil', 'apfs', 'list'], capture_output=True, text=True, timeout=SUBPROCESS_TIMEOUT)
+                return self._RE_APFS_ENCRYPTED.search(result.stdout) is not None
             except Exception as e:
                 self.logger.error(f"Failed to check disk encryption on macOS: {e}")
                 return None
                 
         elif system == "Windows":
             try:
-                result = subprocess.run(['manage-bde', '-status'], capture_output=True, text=True)
-                return "Protection On" in result.stdout
+                result = subprocess.run(['manage-bde', '-status'], capture_output=True, text=True, timeout=SUBPROCESS_TIMEOUT)
+                return self._RE_BITLOCKER_ON.search(result.stdout) is not None
             except Exception as e:
                 self.logger.error(f"Failed to check disk encryption on Windows: {e}")
                 return None
                 
         elif system == "Linux":
             try:
-                result = subprocess.run(['lsblk', '-f'], capture_output=True, text=True)
-                # Look for common encryption indicators like LUKS
-                return "LUKS" in result.stdout or "crypto" in result.stdout
+                result = subprocess.run(['lsblk', '-f'], capture_output=True, text=True, timeout=SUBPROCESS_TIMEOUT)
+                # Look for LUKS-encrypted block devices
+                return self._RE_LUKS.search(result.stdout) is not None
             except Exception as e:
                 self.logger.error(f"Failed to check disk encryption on Linux: {e}")
                 return None
                 
         return None
     
+    def _apt_cache_fresh(self):
+        """Check if the apt package lists were refreshed recently."""
+        for stamp in APT_UPDATE_STAMPS:
+            try:
+                if time.time() - os.stat(stamp).st_mtime < APT_UPDATE_MAX_AGE:
+                    return True
+            except OSError:
+                continue
+        return False
+    
     def check_os_updates(self):
         """Check if OS is up to date."""
-        system = platform.system()
+        system = self._system
         
         if system == "Darwin":  # macOS
             try:
-                result = subprocess.run(['softwareupdate', '-l'], capture_output=True, text=True)
-                return "No new software available" in result.stdout
+                result = subprocess.run(['softwareupdate', '-l'], capture_output=True, text=True, timeout=NETWORK_SUBPROCESS_TIMEOUT)
+                return self._RE_MACOS_UP_TO_DATE.search(result.stdout) is not None
             except Exception as e:
                 self.logger.error(f"Failed to check OS updates on macOS: {e}")
                 return None
@@ -114,10 +377,9 @@ class SystemHealthMonitor:
             try:
                 # Simplified check for demonstration - in production you might need a more reliable method
                 # This PowerShell command might require additional permissions
-                cmd = ["powershell", "-Command", 
-                      "(New-Object -ComObject Microsoft.Update.AutoUpdate).Results.UpdateCount -eq 0"]
-                result = subprocess.run(cmd, capture_output=True, text=True)
-                return "True" in result.stdout
+                if self._win_snapshot is None:
+                    return None
+                return self._win_snapshot.get('updates')
             except Exception as e:
                 self.logger.error(f"Failed to check OS updates on Windows: {e}")
                 return None
@@ -126,13 +388,18 @@ class SystemHealthMonitor:
             try:
                 # First attempt apt-based systems (Ubuntu, Debian)
                 try:
-                    # Update package lists first
-                    subprocess.run(['apt-get', 'update', '-qq'], capture_output=True, check=True, timeout=60)
-                    result = subprocess.run(['apt-get', '-s', 'upgrade'], capture_output=True, text=True, check=True)
-                    return "0 upgraded, 0 newly installed" in result.stdout
+                    # Only refresh package lists if they are stale
+                    if not self._apt_cache_fresh():
+                        try:
+                            subprocess.run(['apt-get', 'update', '-qq'], capture_output=True, timeout=60)
+                        except (subprocess.SubprocessError, OSError) as e:
+                            # Fall back to checking against the existing package lists
+                            self.logger.warning(f"Failed to refresh apt package lists: {e}")
+                    result = subprocess.run(['apt-get', '-s', 'upgrade'], capture_output=True, text=True, check=True, timeout=SUBPROCESS_TIMEOUT)
+                    return self._RE_APT_UP_TO_DATE.search(result.stdout) is not None
                 except (subprocess.SubprocessError, subprocess.TimeoutExpired):
                     # Try yum-based systems (RedHat, CentOS)
-                    result = subprocess.run(['yum', 'check-update', '--quiet'], capture_output=True)
+                    result = subprocess.run(['yum', 'check-update', '--quiet'], capture_output=True, timeout=NETWORK_SUBPROCESS_TIMEOUT)
                     # Return code 0 means no updates, 100 means updates available
                     return result.returncode == 0
             except Exception as e:
@@ -141,9 +408,29 @@ class SystemHealthMonitor:
                     
         return None
     
+    def _query_wmi_antivirus(self):
+        """Check Windows antivirus status through WMI without spawning PowerShell."""
+        # COM must be initialised on each thread that uses WMI
+        pythoncom.CoInitialize()
+        try:
+            # Check Windows Security status; the namespace is missing or the query
+            # fails when a third-party AV has disabled Defender
+            try:
+                defender = wmi.WMI(namespace='root\\Microsoft\\Windows\\Defender')
+                if any(status.AntivirusEnabled for status in defender.MSFT_MpComputerStatus()):
+                    return True
+            except Exception as e:
+                self.logger.info(f"Windows Defender status unavailable: {e}")
+            
+            # Check third-party AV registered with Security Center
+            security_center = wmi.WMI(namespace='root\\SecurityCenter2')
+            return len(security_center.AntiVirusProduct()) > 0
+        finally:
+            pythoncom.CoUninitialize()
+    
     def check_antivirus(self):
         """Check if antivirus is installed and active."""
-        system = platform.system()
+        system = self._system
         
         if system == "Darwin":  # macOS
             # macOS has built-in XProtect
@@ -151,20 +438,24 @@ class SystemHealthMonitor:
             
         elif system == "Windows":
             try:
-                # Check Windows Security status
-                cmd = ["powershell", "-Command", 
-                      "Get-MpComputerStatus | Select-Object AntivirusEnabled -ExpandProperty AntivirusEnabled"]
-                result = subprocess.run(cmd, capture_output=True, text=True)
+                snapshot = self._win_snapshot
+                if wmi is not None:
+                    try:
+                        return self._query_wmi_antivirus()
+                    except Exception as e:
+                        self.logger.error(f"Failed to query antivirus through WMI, using PowerShell: {e}")
+                        # The cycle's snapshot skips AV data when WMI is available
+                        snapshot = self._run_windows_snapshot(['av', 'av2'])
                 
-                if "True" in result.stdout:
+                if snapshot is None:
+                    return None
+                
+                # Check Windows Security status
+                if snapshot.get('av'):
                     return True
                     
                 # Check third-party AV using WMI
-                cmd = ["powershell", "-Command", 
-                      "Get-WmiObject -Namespace root/SecurityCenter2 -Class AntiVirusProduct | ForEach-Object { $_.displayName }"]
-                result = subprocess.run(cmd, capture_output=True, text=True)
-                
-                return len(result.stdout.strip()) > 0
+                return len(snapshot.get('av2') or []) > 0
             except Exception as e:
                 self.logger.error(f"Failed to check antivirus on Windows: {e}")
                 return None
@@ -181,7 +472,7 @@ class SystemHealthMonitor:
                 
                 for cmd in av_checks:
                     try:
-                        result = subprocess.run(cmd, capture_output=True, text=True)
+                        result = subprocess.run(cmd, capture_output=True, text=True, timeout=SUBPROCESS_TIMEOUT)
                         if result.returncode == 0:
                             return True
                     except:
@@ -196,15 +487,19 @@ class SystemHealthMonitor:
     
     def check_sleep_settings(self):
         """Check if inactivity sleep is set to ≤ 10 minutes."""
-        system = platform.system()
+        return self._run_cached_check("sleep_settings_ok", SLEEP_SETTING_SOURCES, self._probe_sleep_settings)
+    
+    def _probe_sleep_settings(self):
+        """Probe the system for the inactivity sleep timeout."""
+        system = self._system
         
         if system == "Darwin":  # macOS
             try:
-                result = subprocess.run(['pmset', '-g'], capture_output=True, text=True)
-                for line in result.stdout.split('\n'):
-                    if 'displaysleep' in line:
-                        minutes = int(line.split()[1])
-                        return minutes <= 10
+                result = subprocess.run(['pmset', '-g'], capture_output=True, text=True, timeout=SUBPROCESS_TIMEOUT)
+                match = self._RE_DISPLAYSLEEP.search(result.stdout)
+                if match:
+                    # A timeout of 0 means the display never sleeps
+                    return 0 < int(match.group(1)) <= 10
                 return False
             except Exception as e:
                 self.logger.error(f"Failed to check sleep settings on macOS: {e}")
@@ -212,38 +507,40 @@ class SystemHealthMonitor:
                 
         elif system == "Windows":
             try:
-                # PowerShell command to check display sleep timeout (Windows 10+)
-                cmd = ["powershell", "-Command", 
-                      "(Get-ItemProperty -Path 'HKLM:\\SYSTEM\\CurrentControlSet\\Control\\Power\\PowerSettings\\238C9FA8-0AAD-41ED-83F4-97BE242C8F20\\7bc4a2f9-d8fc-4469-b07b-33eb785aaca0' -Name 'ACSettingIndex').ACSettingIndex / 60"]
-                result = subprocess.run(cmd, capture_output=True, text=True)
-                if result.stdout.strip():
-                    minutes = float(result.stdout.strip())
-                    return minutes <= 10
+                # Display sleep timeout in minutes (Windows 10+)
+                if winreg is not None:
+                    try:
+                        with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, WINDOWS_SLEEP_SETTING_KEY) as key:
+                            seconds, _ = winreg.QueryValueEx(key, 'ACSettingIndex')
+                        # A timeout of 0 means the display never sleeps
+                        return 0 < seconds / 60 <= 10
+                    except FileNotFoundError:
+                        return False
+                
+                if self._win_snapshot is None:
+                    return None
+                minutes = self._win_snapshot.get('sleep')
+                if minutes is not None:
+                    return 0 < float(minutes) <= 10
                 return False
             except Exception as e:
                 self.logger.error(f"Failed to check sleep settings on Windows: {e}")
                 return None
                 
         elif system == "Linux":
-            try:
-                # Try gsettings for GNOME
-                result = subprocess.run(['gsettings', 'get', 'org.gnome.settings-daemon.plugins.power', 'sleep-inactive-ac-timeout'], capture_output=True, text=True)
-                if result.returncode == 0:
-                    seconds = int(result.stdout.strip())
-                    return seconds <= 600  # 10 minutes in seconds
-            except Exception:
-                pass
+            # Try gsettings for GNOME
+            result = self._run_cached_check("gsettings_sleep", GSETTINGS_SLEEP_SOURCES, self._probe_gsettings_sleep)
+            if result is not None:
+                return result
                 
             try:
                 # Try xset for X11
-                result = subprocess.run(['xset', 'q'], capture_output=True, text=True)
-                for line in result.stdout.split('\n'):
-                    if 'timeout:' in line and 'DPMS is' in line:
-                        parts = line.split()
-                        timeout_index = parts.index('timeout:') + 1
-                        if timeout_index < len(parts):
-                            seconds = int(parts[timeout_index])
-                            return seconds <= 600  # 10 minutes in seconds
+                result = subprocess.run(['xset', 'q'], capture_output=True, text=True, timeout=SUBPROCESS_TIMEOUT)
+                match = self._RE_XSET_TIMEOUT.search(result.stdout)
+                if match:
+                    seconds = int(match.group(1))
+                    # A timeout of 0 means the screen saver is disabled
+                    return 0 < seconds <= 600  # 10 minutes in seconds
             except Exception as e:
                 self.logger.error(f"Failed to check sleep settings on Linux: {e}")
                 
@@ -251,21 +548,48 @@ class SystemHealthMonitor:
                     
         return None
     
+    def _probe_gsettings_sleep(self):
+        """Probe the GNOME inactivity sleep timeout through gsettings."""
+        try:
+            result = subprocess.run(['gsettings', 'get', 'org.gnome.settings-daemon.plugins.power', 'sleep-inactive-ac-timeout'], capture_output=True, text=True, timeout=SUBPROCESS_TIMEOUT)
+            # Value may be printed with a type prefix, e.g. "uint32 600"
+            match = self._RE_GSETTINGS_UINT.search(result.stdout)
+            if result.returncode == 0 and match:
+                seconds = int(match.group(1))
+                # A timeout of 0 means the machine never sleeps
+                return 0 < seconds <= 600  # 10 minutes in seconds
+        except Exception:
+            pass
+        return None
+    
     def collect_system_data(self):
         """Collect all system health data."""
         self.logger.info("Collecting system health data...")
         
+        if self._system == "Windows":
+            self._refresh_windows_snapshot()
+        
+        futures = {
+            "disk_encryption": self._executor.submit(self.check_disk_encryption),
+            "os_updated": self._executor.submit(self.check_os_updates),
+            "antivirus_active": self._executor.submit(self.check_antivirus),
+            "sleep_settings_ok": self._executor.submit(self.check_sleep_settings)
+        }
+        
+        checks = {}
+        for name, future in futures.items():
+            try:
+                checks[name] = future.result(timeout=120)
+            except Exception as e:
+                self.logger.error(f"Health check {name} failed: {e}")
+                checks[name] = None
+        
         data = {
             "machine_id": self.machine_id,
             "timestamp": datetime.now().isoformat(),
-            "os_name": platform.system(),
-            "os_version": platform.version(),
-            "checks": {
-                "disk_encryption": self.check_disk_encryption(),
-                "os_updated": self.check_os_updates(),
-                "antivirus_active": self.check_antivirus(),
-                "sleep_settings_ok": self.check_sleep_settings()
-            }
+            "os_name": self._system,
+            "os_version": self._version,
+            "checks": checks
         }
         
         return data
@@ -282,26 +606,42 @@ class SystemHealthMonitor:
         
         return current_checks != last_checks
     
+    def _build_payload(self, data):
+        """Build the report payload, sending only changed checks when possible."""
+        full = (not self.last_report or
+                time.time() - self._last_full_report_ts >= FULL_REPORT_INTERVAL)
+        
+        payload = dict(data, full=full)
+        if not full:
+            last_checks = self.last_report.get('checks', {})
+            payload['checks'] = {k: v for k, v in data['checks'].items() if last_checks.get(k) != v}
+        
+        return payload
+    
     def send_report(self, data):
         """Send report to API endpoint."""
         try:
             self.logger.info(f"Sending report to API: {self.api_endpoint}")
             
-            headers = {
-                "Content-Type": "application/json",
-                "User-Agent": f"SystemHealthMonitor/{platform.system()}"
-            }
+            payload = self._build_payload(data)
             
-            self.logger.info(f"Request headers: {headers}")
-            self.logger.info(f"Request data: {json.dumps(data)}")
+            raw_body = json.dumps(payload)
             
-            response = requests.post(self.api_endpoint, json=data, headers=headers)
+            self.logger.debug(f"Request headers: {dict(self._session.headers)}")
+            self.logger.debug(f"Request data: {raw_body}")
             
-            self.logger.info(f"API response: {response.status_code} - {response.text}")
+            body = gzip.compress(raw_body.encode('utf-8'))
+            response = self._session.post(self.api_endpoint, data=body,
+                                          headers={"Content-Encoding": "gzip"}, timeout=30)
+            
+            self.logger.debug(f"API response: {response.status_code} - {response.text}")
             
             if response.status_code == 200:
-                self.logger.info(f"Successfully reported to API: {response.status_code}")
+                self.logger.info(f"Successfully reported to API: {response.status_code} ({len(body)} bytes sent)")
                 self.last_report = data
+                self._save_last_report(data)
+                if payload['full']:
+                    self._last_full_report_ts = time.time()
                 return True
             else:
                 self.logger.error(f"Failed to report to API: {response.status_code} - {response.text}")
@@ -323,13 +663,18 @@ class SystemHealthMonitor:
                 if self.should_report(current_data):
                     self.logger.info("Changes detected, sending report")
                     self.send_report(current_data)
+                    self._current_interval = self.check_interval
                 else:
                     self.logger.info("No changes detected, skipping report")
+                    self._current_interval = min(self._current_interval * BACKOFF_FACTOR,
+                                                 max(MAX_CHECK_INTERVAL, self.check_interval))
                     
             except Exception as e:
                 self.logger.error(f"Error in periodic check: {e}")
+                self._current_interval = self.check_interval
                 
-            time.sleep(self.check_interval)
+            self.logger.info(f"Next check in {self._current_interval:.0f} seconds")
+            time.sleep(self._current_interval)
     
     def start(self):
         """Start the monitoring daemon."""
@@ -341,7 +686,10 @@ class SystemHealthMonitor:
         # Run initial check
         try:
             current_data = self.collect_system_data()
-            self.send_report(current_data)
+            if self.should_report(current_data):
+                self.send_report(current_data)
+            else:
+                self.logger.info("No changes since last report, skipping initial report")
         except Exception as e:
             self.logger.error(f"Error in initial check: {e}")
         